@@ -1,22 +1,125 @@
 import argparse
 import csv
+import itertools
+import logging
 import os
+import re
 import sys
-from colorama import init, Fore, Style
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from src.amazon_scraper import AmazonScraper
-from src.exporter import export_product_data, export_combined_products, print_summary
+from src.exporter import CsvRowSpool, ensure_output_dir, export_product_data, export_combined_products, print_summary
+from src.utils import load_config
+from src.logger import setup_logger, init_colors
 
 
 # Initialize colorama for colored console output
-init(autoreset=True)
+init_colors()
 
-def process_asin(scraper, asin, combined_csv_data=None):
+# Console messages go through the shared ColoredFormatter; %-style arguments
+# are only interpolated when a record is actually emitted
+logger = setup_logger('Main')
+
+# Default number of ASINs processed in parallel when not set in config.json
+DEFAULT_MAX_WORKERS = 5
+
+# An ASIN is exactly 10 uppercase letters/digits
+_ASIN_RE = re.compile(r'[A-Z0-9]{10}')
+
+# AmazonScraper keeps per-session state (cookies, CSRF tokens), so each worker
+# thread gets its own instance instead of sharing one across threads
+_thread_local = threading.local()
+
+# Every scraper handed out to a worker, so their sessions can be closed once
+# the run is over
+_thread_scrapers = []
+
+def get_thread_scraper():
+    """Return the AmazonScraper owned by the current worker thread"""
+    scraper = getattr(_thread_local, 'scraper', None)
+    if scraper is None:
+        scraper = AmazonScraper()
+        # process_asin relies on the scraper reusing one HTTP session
+        assert hasattr(scraper, 'session'), "AmazonScraper must keep a reusable session"
+        _thread_local.scraper = scraper
+        _thread_scrapers.append(scraper)
+    return scraper
+
+def close_thread_scrapers():
+    """Close the sessions of all worker scrapers"""
+    while _thread_scrapers:
+        _thread_scrapers.pop().close()
+
+def normalize_asin(value):
+    """Return the cleaned-up ASIN, or None if the value is not a valid ASIN"""
+    asin = value.strip().upper()
+    return asin if _ASIN_RE.fullmatch(asin) else None
+
+def _load_csv_asins(path):
+    """Yield raw values of the 'asin' column of a CSV file
+
+    Raises:
+        ValueError: If the CSV file has no 'asin' column
+    """
+    with open(path, 'r', newline='') as f:
+        # Plain csv.reader: locate the 'asin' column once and index rows by
+        # position instead of building a dict for every row
+        csv_reader = csv.reader(f)
+        header = [field.strip().lower() for field in next(csv_reader, [])]
+        if 'asin' not in header:
+            raise ValueError("CSV file must have an 'asin' column")
+        index = header.index('asin')
+        yield from (row[index] for row in csv_reader if len(row) > index)
+
+def _load_txt_asins(path):
+    """Yield the lines of a TXT file with one ASIN per line"""
+    with open(path, 'r') as f:
+        yield from f
+
+# Input file loaders by extension - anything else is read as TXT
+LOADERS = {
+    '.csv': _load_csv_asins,
+    '.txt': _load_txt_asins,
+}
+
+def load_asins(path):
+    """Yield valid ASINs from a TXT file (one per line) or a CSV file with an 'asin' column
+
+    Args:
+        path: Path to the TXT or CSV file
+
+    Yields:
+        str: Each valid ASIN found in the file
+
+    Raises:
+        ValueError: If a CSV file has no 'asin' column
+    """
+    loader = LOADERS.get(os.path.splitext(path)[1].lower(), _load_txt_asins)
+    for value in loader(path):
+        asin = normalize_asin(value)
+        if asin:
+            yield asin
+
+def counting(iterable, counter):
+    """Yield items from iterable, incrementing counter[0] for each one"""
+    for item in iterable:
+        counter[0] += 1
+        yield item
+
+def process_asin(scraper, asin, combined_csv_data=None, timestamp=None, slot=None):
     """Process a single ASIN and save its data
+
+    The scraper is expected to hold one HTTP session (`scraper.session`) that
+    it reuses across calls, so cookies and TLS connections carry over from
+    one ASIN to the next instead of being renegotiated per product.
     
     Args:
         scraper: The AmazonScraper instance
         asin: The ASIN to process
-        combined_csv_data: List to append CSV data for multiple products
+        combined_csv_data: CsvRowSpool collecting CSV data for multiple products
+        timestamp: Run-level timestamp shared by all output filenames
+        slot: Position of this ASIN in the combined CSV; appends when None
         
     Returns:
         bool: Success or failure
@@ -25,23 +128,32 @@ def process_asin(scraper, asin, combined_csv_data=None):
         # Get product data
         result = scraper.get_product_data(asin)
         if not result:
-            print(f"{Fore.RED}[ERROR] Failed to get data for ASIN: {asin}{Style.RESET_ALL}")
+            logger.error("Failed to get data for ASIN: %s", asin)
             return False
 
+        # Guard anything costly to build so it is skipped unless DEBUG is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("ASIN %s sections: %s", asin, ', '.join(map(str, result)))
+
         # Export product data to files and get CSV data
-        success, csv_data = export_product_data(result, asin)
+        success, csv_data = export_product_data(result, asin, timestamp)
         
         # If export successful and we have CSV data, add to combined data
         if success and csv_data and combined_csv_data is not None:
-            combined_csv_data.append(csv_data)
+            combined_csv_data.append(csv_data, slot)
             
         return success
 
     except Exception as e:
-        print(f"{Fore.RED}[ERROR] Failed to process ASIN {asin}: {str(e)}{Style.RESET_ALL}")
+        logger.error("Failed to process ASIN %s: %s", asin, e)
         return False
 
-def main():
+def parse_args():
+    """Parse command line arguments
+
+    Returns:
+        argparse.Namespace: The parsed arguments, or None if no ASIN source was given
+    """
     # Set up argument parser with simple help messages
     parser = argparse.ArgumentParser(
         description='Amazon Product Data Scraper',
@@ -67,62 +179,100 @@ Examples:
     # Check if any ASINs were provided
     if not args.asins and not args.file:
         parser.print_help()
-        print(f"\n{Fore.RED}[ERROR] Please provide at least one ASIN or a file containing ASINs{Style.RESET_ALL}")
-        return
+        logger.error("Please provide at least one ASIN or a file containing ASINs")
+        return None
 
-    # Collect all ASINs
-    all_asins = set(args.asins)  # Start with command line ASINs
+    return args
 
-    # Add ASINs from file if provided
-    if args.file:
-        try:
-            file_ext = os.path.splitext(args.file)[1].lower()
-            
-            if file_ext == '.csv':
-                # Handle CSV file
-                with open(args.file, 'r', newline='') as f:
-                    csv_reader = csv.DictReader(f)
-                    if 'asin' not in csv_reader.fieldnames:
-                        print(f"{Fore.RED}[ERROR] CSV file must have an 'asin' column{Style.RESET_ALL}")
-                        return
-                    file_asins = [row['asin'].strip() for row in csv_reader if row['asin'].strip()]
-                    all_asins.update(file_asins)
-            else:
-                # Handle text file (one ASIN per line)
-                with open(args.file, 'r') as f:
-                    file_asins = [line.strip() for line in f if line.strip()]
-                    all_asins.update(file_asins)
-                    
-            print(f"{Fore.GREEN}[INFO] Loaded {len(file_asins)} ASINs from file: {args.file}{Style.RESET_ALL}")
-        except Exception as e:
-            print(f"{Fore.RED}[ERROR] Failed to read ASINs from file: {str(e)}{Style.RESET_ALL}")
-            return
-
-    # Remove any empty ASINs
-    all_asins = [asin for asin in all_asins if asin]
+def collect_asins(args):
+    """Collect valid ASINs from the command line and the optional input file
 
-    if not all_asins:
-        print(f"{Fore.RED}[ERROR] No valid ASINs found{Style.RESET_ALL}")
-        return
+    Args:
+        args: The parsed command line arguments
+
+    Returns:
+        list: The ASINs to process, or None if the input file could not be read
+    """
+    # Start with command line ASINs
+    cli_asins = []
+    for value in args.asins:
+        asin = normalize_asin(value)
+        if asin:
+            cli_asins.append(asin)
+        else:
+            logger.warning("Skipping invalid ASIN: %s", value)
+
+    if not args.file:
+        # Ordered dedup in one pass - ASINs are processed in the order they were given
+        return list(dict.fromkeys(cli_asins))
 
-    print(f"\n{Fore.CYAN}Processing {len(all_asins)} ASINs...{Style.RESET_ALL}")
+    # Add ASINs from file - streamed straight into the dedup, so the file's
+    # ASINs are never held in a list of their own just to count them
+    try:
+        loaded = [0]
+        all_asins = list(dict.fromkeys(itertools.chain(cli_asins, counting(load_asins(args.file), loaded))))
+    except Exception as e:
+        logger.error("Failed to read ASINs from file: %s", e)
+        return None
+    logger.info("Loaded %d ASINs from file: %s", loaded[0], args.file)
+    return all_asins
 
-    # Initialize scraper
-    scraper = AmazonScraper()
+def run_pipeline(asins, max_workers):
+    """Process ASINs in parallel and export the combined CSV
+
+    Args:
+        asins: The ASINs to process
+        max_workers: Number of worker threads
+
+    Returns:
+        int: Number of successfully processed ASINs
+    """
+    # Flattened rows are spooled to disk under each ASIN's index as workers
+    # finish, and streamed back in input order for the combined CSV
+    asins = list(asins)
 
-    # Prepare for CSV data collection
-    combined_csv_data = []
+    # One timestamp per run keeps all files of a run grouped together
+    run_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    ensure_output_dir()
+
+    def worker(slot, asin):
+        logger.info("Processing ASIN: %s", asin)
+        return process_asin(get_thread_scraper(), asin, combined_csv_data, run_timestamp, slot)
 
-    # Process each ASIN
     success_count = 0
-    for asin in all_asins:
-        print(f"\n{Fore.CYAN}Processing ASIN: {asin}{Style.RESET_ALL}")
-        if process_asin(scraper, asin, combined_csv_data):
-            success_count += 1
-
-    # Export combined product data to CSV
-    if combined_csv_data:
-        export_combined_products(combined_csv_data)
+    with CsvRowSpool() as combined_csv_data:
+        # Process ASINs in parallel - the work is dominated by network I/O
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(worker, i, asin) for i, asin in enumerate(asins)]
+            for future in as_completed(futures):
+                if future.result():
+                    success_count += 1
+        close_thread_scrapers()
+
+        # Export combined product data to CSV - ASINs that failed have no row
+        if combined_csv_data:
+            export_combined_products(combined_csv_data, run_timestamp)
+
+    return success_count
+
+def main():
+    args = parse_args()
+    if args is None:
+        return
+
+    all_asins = collect_asins(args)
+    if all_asins is None:
+        return
+
+    if not all_asins:
+        logger.error("No valid ASINs found")
+        return
+
+    logger.info("Processing %d ASINs...", len(all_asins))
+
+    config = load_config()
+    max_workers = max(1, min(config.get('max_workers', DEFAULT_MAX_WORKERS), len(all_asins)))
+    success_count = run_pipeline(all_asins, max_workers)
 
     # Print summary of processing
     print_summary(len(all_asins), success_count)
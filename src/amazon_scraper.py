@@ -1,45 +1,236 @@
 """
 Amazon Scraper Request Flow:
-1. Initial homepage request to get cookies
-2. Product page request to get first CSRF token + additional cookies
-3. Modal HTML request to get second CSRF token
-4. Product page request with updated location
-5. All offers page request
-6. Repeat all offers page request with Prime-only filter (if Prime filter available)
+1. Product page request to get first CSRF token + cookies (the first product
+   of a session also bootstraps the session with it, no separate warmup request)
+2. Modal HTML request to get second CSRF token
+3. All offers page request
+4. Repeat all offers page request with Prime-only filter (if Prime filter available)
+
+Sessions (and their cookies) are kept for the scraper's lifetime and only
+rebuilt after Amazon rejects them.
 """
 
-import tls_client
 import json
-import http.cookies
 import os
 import time
-import random
-import aiohttp
+import re
 from typing import Dict, Any, List
 import threading
-from datetime import datetime
-import asyncio
-from queue import Queue
-from colorama import init, Fore, Style
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from collections import deque
 
 # Handle imports differently based on how the script is being run
 try:
     # When imported as a module from parent directory
     from src.parsers import parse_offers, parse_product_details
-    from src.logger import setup_logger
-    from src.utils import load_config
+    from src.logger import setup_logger, init_colors
+    from src.utils import load_config, TTLCache
 except ImportError:
     # When run directly from src directory
     from parsers import parse_offers, parse_product_details
-    from logger import setup_logger
-    from utils import load_config
+    from logger import setup_logger, init_colors
+    from utils import load_config, TTLCache
+
+try:
+    # Optional faster JSON parser/encoder (pip install orjson)
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configuration constants
 SAVE_OUTPUT = False  # Set to True to save files to output folder
 SAVE_DEBUG = True  # Set to True to save debug files to output_debug folder
 
-# Initialize colorama
-init(autoreset=True)
+# Debug and output files are written by one background thread, off the
+# request path. Pending writes are finished before the interpreter exits
+_file_write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='file-write')
+
+# Product page status codes that mean Amazon rejected the session itself or
+# rate-limited its proxy (429) - the proxy's failure is reported for parking
+SESSION_REJECTED_STATUS_CODES = (403, 429, 503)
+
+# Seconds a product page CSRF token is reused before the page is fetched
+# again (Amazon rotates them). Parsed product details are kept for
+# `product_details_cache_ttl` seconds from config.json
+CSRF_CACHE_TTL = 10 * 60
+DEFAULT_PRODUCT_DETAILS_CACHE_TTL = 10 * 60
+
+# Request headers, built once. tls_client copies them into each request, so
+# only the per-request fields (None placeholders that keep the header order)
+# are overlaid per call
+PRODUCT_PAGE_HEADERS = {
+    'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+    'accept-language': 'en-US,en;q=0.9,be;q=0.8,ar;q=0.7',
+    'cache-control': 'max-age=0',
+    'device-memory': '8',
+    'dnt': '1',
+    'downlink': '8.85',
+    'dpr': '1',
+    'ect': '4g',
+    'priority': 'u=0, i',
+    'referer': None,  # the product URL, set per request
+    'upgrade-insecure-requests': '1',
+    'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36',
+    'viewport-width': '1120'
+}
+
+MODAL_HEADERS = {
+    'accept': 'text/html,*/*',
+    'accept-language': 'en-US,en;q=0.9',
+    'anti-csrftoken-a2z': None,  # the product page CSRF token, set per request
+    'content-type': 'application/json',
+    'device-memory': '8',
+    'downlink': '8.85',
+    'dpr': '1',
+    'ect': '4g',
+    'origin': 'https://www.amazon.in',
+    'referer': 'https://www.amazon.in/',
+    'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36',
+    'viewport-width': '1120',
+    'x-requested-with': 'XMLHttpRequest'
+}
+
+OFFERS_PAGE_HEADERS = {
+    'accept': 'text/html,*/*',
+    'accept-language': 'en-US,en;q=0.9,be;q=0.8,ar;q=0.7',
+    'device-memory': '8',
+    'dnt': '1',
+    'downlink': '8.65',
+    'dpr': '1',
+    'ect': '4g',
+    'priority': 'u=1, i',
+    'referer': 'https://www.amazon.in/SanDisk-Extreme-microSDXC-Memory-Adapter/dp/B09X7CRKRZ/136-1912212-8057361?pd_rd_w=YOwz1&content-id=amzn1.sym.53b72ea0-a439-4b9d-9319-7c2ee5c88973&pf_rd_p=53b72ea0-a439-4b9d-9319-7c2ee5c88973&pf_rd_r=VBP362SNAXS96Y4DP9V1&pd_rd_wg=Z1aCo&pd_rd_r=ff18059e-7648-474f-8a5c-4a7ed8d8ba55&pd_rd_i=B09X7CRKRZ&th=1',
+    'rtt': '150',
+    'sec-ch-device-memory': '8',
+    'sec-ch-dpr': '1',
+    'sec-ch-ua': '"Not A(Brand";v="8", "Chromium";v="132", "Google Chrome";v="132"',
+    'sec-ch-ua-mobile': '?0',
+    'sec-ch-ua-platform': '"Windows"',
+    'sec-ch-ua-platform-version': '"15.0.0"',
+    'sec-ch-viewport-width': '1674',
+    'sec-fetch-dest': 'empty',
+    'sec-fetch-mode': 'cors',
+    'sec-fetch-site': 'same-origin',
+    'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36',
+    'viewport-width': '1674',
+    'x-requested-with': 'XMLHttpRequest'
+}
+
+# The product page carries the first CSRF token in the data-a-modal JSON of
+# the location modal element, the modal HTML carries the second one in a script
+MODAL_ELEMENT_ID = 'nav-global-location-data-modal-action'
+_MODAL_ID_ANCHOR = b'id="' + MODAL_ELEMENT_ID.encode() + b'"'
+# Both are searched in the raw response bytes: no text is needed around the
+# tokens, and bytes scan faster than non-Latin-1 str
+_RE_MODAL_DATA = re.compile(
+    re.escape(_MODAL_ID_ANCHOR) + rb'[^>]*?data-a-modal=([\'"])(\{.*?\})\1', re.DOTALL
+)
+_RE_MODAL_CSRF_TOKEN = re.compile(rb'CSRF_TOKEN\s*:\s*"([^"]*)"')
+
+def load_json(data):
+    """Parse JSON from str or UTF-8 bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def write_json(path, data):
+    """Write data to path as indented UTF-8 JSON, using orjson when available"""
+    if orjson is not None:
+        # Non-string keys occur in product data (e.g. review star levels)
+        json_bytes = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        json_bytes = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(json_bytes)
+
+def may_have_prime_filter(offers_html):
+    """Cheap substring check run before parsing: False means the offers page
+    certainly has no Prime filter, True means parse_offers may find one"""
+    return 'aod-filter-list' in offers_html and 'a-icon-prime' in offers_html
+
+class ProxyPool:
+    """
+    Round-robin pool of proxy URLs shared by all scrapers, so concurrent
+    sessions go out through different proxies. A proxy whose sessions get
+    rejected `max_failures` times within `failure_window` seconds is parked
+    for `park_seconds` and skipped meanwhile.
+    """
+
+    def __init__(self, proxies, max_failures=3, failure_window=5 * 60, park_seconds=10 * 60):
+        self._proxies = deque(proxies)
+        self.max_failures = max_failures
+        self.failure_window = failure_window
+        self.park_seconds = park_seconds
+        self._failures = {proxy: deque() for proxy in proxies}
+        self._parked_until = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._proxies)
+
+    def next_proxy(self):
+        """Return the next proxy in turn that is not parked (or the next one if all are)"""
+        with self._lock:
+            now = time.monotonic()
+            for _ in range(len(self._proxies)):
+                proxy = self._proxies[0]
+                self._proxies.rotate(-1)
+                if self._parked_until.get(proxy, 0) <= now:
+                    return proxy
+            proxy = self._proxies[0]
+            self._proxies.rotate(-1)
+            return proxy
+
+    def report_failure(self, proxy):
+        """Record a rejected session for proxy, parking it after too many in the window"""
+        with self._lock:
+            failures = self._failures.get(proxy)
+            if failures is None:
+                return
+            now = time.monotonic()
+            failures.append(now)
+            while failures and now - failures[0] > self.failure_window:
+                failures.popleft()
+            if len(failures) >= self.max_failures:
+                self._parked_until[proxy] = now + self.park_seconds
+                failures.clear()
+
+def load_proxies(path='proxies.txt'):
+    """Read ip:port:username:password lines into proxy URLs"""
+    proxies = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                ip, port, username, password = line.split(':')
+                proxies.append(f"http://{username}:{password}@{ip}:{port}")
+    return proxies
+
+# The pool is built from proxies.txt once per process and shared by all scrapers
+_proxy_pool = None
+_proxy_pool_loaded = False
+_proxy_pool_lock = threading.Lock()
+
+def get_proxy_pool(logger):
+    """Return the shared ProxyPool, or None when no proxies are available"""
+    global _proxy_pool, _proxy_pool_loaded
+    with _proxy_pool_lock:
+        if not _proxy_pool_loaded:
+            _proxy_pool_loaded = True
+            try:
+                # Read and parse proxies from proxies.txt if it exists
+                if os.path.exists('proxies.txt'):
+                    proxies = load_proxies('proxies.txt')
+                    if proxies:
+                        _proxy_pool = ProxyPool(proxies)
+                        logger.success(f"Loaded {len(proxies)} proxies from proxies.txt")
+                    else:
+                        logger.warning("proxies.txt is empty - running without proxy")
+                else:
+                    logger.warning("proxies.txt not found - running without proxy")
+            except Exception as e:
+                logger.error(f"Error reading proxies.txt: {str(e)} - running without proxy")
+        return _proxy_pool
 
 class AmazonScraper:
     def __init__(self):
@@ -47,31 +238,10 @@ class AmazonScraper:
         # Get config first
         config = load_config()
         
-        # Initialize proxy as None by default
+        # Proxies are taken from the shared pool, one per session
         self.proxy = None
-        
-        if config.get('allow_proxy', True):
-            try:
-                # Read and parse proxies from proxies.txt if it exists
-                if os.path.exists('proxies.txt'):
-                    with open('proxies.txt', 'r') as f:
-                        proxies = [line.strip() for line in f.readlines() if line.strip()]
-                    
-                    if proxies:
-                        # Randomly select a proxy
-                        proxy_line = random.choice(proxies)
-                        ip, port, username, password = proxy_line.split(':')
-                        
-                        # Format the proxy string
-                        self.proxy = f"http://{username}:{password}@{ip}:{port}"
-                        self.logger.success(f"AmazonScraper initialized with proxy: {ip}:{port}")
-                    else:
-                        self.logger.warning("proxies.txt is empty - running without proxy")
-                else:
-                    self.logger.warning("proxies.txt not found - running without proxy")
-            except Exception as e:
-                self.logger.error(f"Error reading proxies.txt: {str(e)} - running without proxy")
-        else:
+        self.proxy_pool = get_proxy_pool(self.logger) if config.get('allow_proxy', True) else None
+        if self.proxy_pool is None and not config.get('allow_proxy', True):
             self.logger.info("AmazonScraper initialized without proxy (disabled in config)")
         
         # Create output directories if saving is enabled
@@ -81,11 +251,22 @@ class AmazonScraper:
             os.makedirs(self.output_dir, exist_ok=True)
         if SAVE_DEBUG:
             os.makedirs(self.debug_dir, exist_ok=True)
+        # Raw offers HTML is only dumped (in the background) in debug mode
+        self.offers_dump_dir = self.debug_dir if SAVE_DEBUG else None
 
         self.session = None
         self.initial_csrf_token = None
         self.is_initialized = False
-        self.product_details = None
+        # Details of the product being scraped, parsed in the background
+        self.product_details_future = None
+        self.executor = None
+
+        # Per-ASIN caches so repeated requests for a product skip the product
+        # page. Tokens belong to the session, so they are dropped with it
+        self.csrf_cache = TTLCache(CSRF_CACHE_TTL)
+        self.product_details_cache = TTLCache(
+            config.get('product_details_cache_ttl', DEFAULT_PRODUCT_DETAILS_CACHE_TTL)
+        )
 
     def _log_info(self, message):
         self.logger.info(message)
@@ -99,49 +280,112 @@ class AmazonScraper:
     def _log_error(self, message):
         self.logger.error(message)
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def close(self):
+        """Release the HTTP session; the next request starts a new one"""
+        if self.session is not None:
+            # Older tls_client releases have no close(), dropping the session is all we can do
+            close_session = getattr(self.session, 'close', None)
+            if close_session is not None:
+                try:
+                    close_session()
+                except Exception as e:
+                    self._log_warning(f"Failed to close session: {str(e)}")
+            self.session = None
+        self.is_initialized = False
+        self.csrf_cache.clear()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    def purge_cache(self):
+        """Drop all cached CSRF tokens and product details"""
+        self.csrf_cache.clear()
+        self.product_details_cache.clear()
+
     def _create_fresh_session(self):
         """Create a new session with current configuration"""
         try:
+            # Imported on first use: tls_client loads its native library, which
+            # only scraping (not importing this module) needs
+            import tls_client
+
+            # The chrome126 profile negotiates HTTP/2, so all requests of a
+            # session (including the concurrent Prime offers request) are
+            # multiplexed over one connection with a Chrome TLS fingerprint
             self.session = tls_client.Session(
                 client_identifier="chrome126",
-                random_tls_extension_order=True
+                random_tls_extension_order=True,
+                force_http1=False
             )
             
-            # Apply proxy if configured
-            if self.proxy:
+            # Every new session takes the next proxy from the pool
+            if self.proxy_pool is not None:
+                self.proxy = self.proxy_pool.next_proxy()
                 self.session.proxies = self.proxy
-            
-            self._log_info("Created fresh session")
+                self._log_info(f"Created fresh session via proxy: {self.proxy.rsplit('@', 1)[-1]}")
+            else:
+                self._log_info("Created fresh session")
             return True
         except Exception as e:
             self._log_error(f"Failed to create session: {str(e)}")
             return False
 
+    def _get_executor(self):
+        """Return the background workers (product page parsing, Prime offers
+        fetch), starting them on first use"""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='scraper')
+        return self.executor
+
+    def _parse_product_page(self, asin, html):
+        """Parse product details from the product page HTML (and save them if enabled)
+
+        Returns:
+            dict: This ASIN's product details, or None if parsing failed. Never
+            the details of a previously scraped product.
+        """
+        product_details = None
+        try:
+            product_details = parse_product_details(html)
+            if product_details:
+                self.product_details_cache.set(asin, product_details)
+            
+            # Save product details to JSON file if saving is enabled
+            if SAVE_OUTPUT:
+                json_filename = f'{self.output_dir}/product_details_{asin}_{time.strftime("%Y%m%d_%H%M%S")}.json'
+                write_json(json_filename, product_details)
+                self._log_success(f"Saved parsed product details to {json_filename}")
+        except Exception as e:
+            self._log_error(f"Failed to parse or save product details: {str(e)}")
+        return product_details
+
     def _make_initial_product_page_request(self, asin, parse_details=False):
         """Make initial request to product page and get CSRF token"""
         if not self.session:
             if not self._create_fresh_session():
                 return None
 
+        # Serve recently scraped products from the cache without any request
+        csrf_token = self.csrf_cache.get(asin)
+        if csrf_token is not None:
+            product_details = self.product_details_cache.get(asin) if parse_details else None
+            if not parse_details or product_details is not None:
+                self._log_info(f"Using cached product page data for ASIN: {asin}")
+                if parse_details:
+                    self.product_details_future = Future()
+                    self.product_details_future.set_result(product_details)
+                return csrf_token
+
         self._log_info(f"Making initial request for ASIN: {asin}")
-        initial_url = "https://www.amazon.in"
         product_url = f"https://www.amazon.in/dp/{asin}"
-        print(product_url)
-        headers = {
-            'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-            'accept-language': 'en-US,en;q=0.9,be;q=0.8,ar;q=0.7',
-            'cache-control': 'max-age=0',
-            'device-memory': '8',
-            'dnt': '1',
-            'downlink': '8.85',
-            'dpr': '1',
-            'ect': '4g',
-            'priority': 'u=0, i',
-            'referer': product_url,
-            'upgrade-insecure-requests': '1',
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36',
-            'viewport-width': '1120'
-        }
+        headers = {**PRODUCT_PAGE_HEADERS, 'referer': product_url}
 
         try:
             self._log_info("Accessing product page...")
@@ -150,105 +394,62 @@ class AmazonScraper:
             
             if response.status_code != 200:
                 self._log_error(f"Product page request failed with status code: {response.status_code}")
+                if response.status_code in SESSION_REJECTED_STATUS_CODES:
+                    # The session (cookies) got blocked - rebuild it on the next
+                    # request, and don't trust anything cached before the block
+                    self.purge_cache()
+                    if self.proxy_pool is not None and self.proxy:
+                        self.proxy_pool.report_failure(self.proxy)
+                    self.close()
                 return None
 
-            # Save the product page HTML to debug folder if enabled
+            # Save the product page HTML to debug folder if enabled. The write
+            # happens in the background; the folder was created in __init__
             if SAVE_DEBUG:
-                os.makedirs(self.debug_dir, exist_ok=True)
                 html_filename = f'{self.debug_dir}/product_page_{asin}.html'
-                with open(html_filename, 'w', encoding='utf-8', errors='ignore') as f:
-                    f.write(response.text)
-                    self._log_success(f"Saved product page to {html_filename}")
+                _file_write_executor.submit(self._write_file, html_filename, response.content, True)
 
-            # Parse product details only if explicitly requested and if we don't have them
+            # Parse product details only if explicitly requested. Parsing runs in
+            # the background while the modal and offers pages are requested
             if parse_details:
-                try:
-                    self.product_details = parse_product_details(response.text)
-                    
-                    # Save product details to JSON file if saving is enabled
-                    if SAVE_OUTPUT:
-                        json_filename = f'{self.output_dir}/product_details_{asin}_{time.strftime("%Y%m%d_%H%M%S")}.json'
-                        with open(json_filename, 'w', encoding='utf-8') as f:
-                            json.dump(self.product_details, f, indent=2, ensure_ascii=False)
-                            self._log_success(f"Saved parsed product details to {json_filename}")
-                except Exception as e:
-                    self._log_error(f"Failed to parse or save product details: {str(e)}")
+                self.product_details_future = self._get_executor().submit(
+                    self._parse_product_page, asin, response.text
+                )
 
-            # Extract CSRF token using string operations
+            # Extract CSRF token with the precompiled patterns
             self._log_info("Extracting CSRF token...")
             extraction_start = time.time()
-            html = response.text
-            modal_id = 'nav-global-location-data-modal-action'
+            html = response.content
             
             try:
-                # Find the modal element
-                modal_start = html.find(f'id="{modal_id}"')
+                # The modal JSON is the data-a-modal attribute of the location
+                # modal element, quoted with ' (raw JSON) or " (&quot; escaped)
+                modal_start = html.find(_MODAL_ID_ANCHOR)
                 if modal_start == -1:
                     self._log_error(f"Modal element not found (string search)")
                     return None
-                    
-                # Find data-a-modal attribute
-                data_modal_start = html.find('data-a-modal=\'', modal_start)  # Note: Using single quote here
-                if data_modal_start == -1:
-                    # Try with encoded quotes as fallback
-                    data_modal_start = html.find('data-a-modal="{', modal_start)
-                    if data_modal_start == -1:
-                        self._log_error("data-a-modal attribute not found (string search)")
-                        return None
-                    
-                # Find the start of the JSON content
-                json_start = data_modal_start + len('data-a-modal="')
-                
-                # Find the matching end quote by counting brackets
-                bracket_count = 0
-                in_quotes = False
-                escape_next = False
-                json_end = json_start
-                
-                while json_end < len(html):
-                    char = html[json_end]
-                    
-                    if escape_next:
-                        escape_next = False
-                    elif char == '\\':
-                        escape_next = True
-                    elif char == '"' and not in_quotes:
-                        if bracket_count == 0:
-                            break
-                        in_quotes = True
-                    elif char == '"' and in_quotes:
-                        in_quotes = False
-                    elif not in_quotes:
-                        if char == '{':
-                            bracket_count += 1
-                        elif char == '}':
-                            bracket_count -= 1
-                            if bracket_count == 0:
-                                json_end += 1
-                                break
-                
-                    json_end += 1
-                
-                if json_end >= len(html):
-                    self._log_error("Could not find proper end of JSON data")
+                modal_match = _RE_MODAL_DATA.match(html, modal_start)
+                if not modal_match:
+                    self._log_error("data-a-modal attribute not found (string search)")
                     return None
                     
-                # Extract and parse the JSON
-                json_str = html[json_start:json_end]
-                json_str = json_str.replace('&quot;', '"')  # Handle HTML entities
+                # Extract and parse the JSON - the UTF-8 bytes are parsed as they are
+                json_str = modal_match.group(2)
+                json_str = json_str.replace(b'&quot;', b'"')  # Handle HTML entities
                 
-                modal_data = json.loads(json_str)
+                modal_data = load_json(json_str)
                 
                 if 'ajaxHeaders' in modal_data and 'anti-csrftoken-a2z' in modal_data['ajaxHeaders']:
                     csrf_token = modal_data['ajaxHeaders']['anti-csrftoken-a2z']
                     extraction_time = round((time.time() - extraction_start) * 1000, 2)  # Convert to milliseconds
                     self._log_success(f"CSRF token extracted in {extraction_time}ms: {csrf_token[:10]}...")
+                    self.csrf_cache.set(asin, csrf_token)
                     return csrf_token
                 
                 self._log_error("CSRF token not found in modal data")
                 return None
                 
-            except json.JSONDecodeError as e:
+            except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses it
                 self._log_error(f"Failed to parse modal JSON data: {str(e)}")
                 return None
             except Exception as e:
@@ -268,21 +469,7 @@ class AmazonScraper:
         self._log_info("Requesting modal HTML...")
         modal_url = "https://www.amazon.in/portal-migration/hz/glow/get-rendered-address-selections?deviceType=desktop&pageType=Detail&storeContext=photo&actionSource=desktop-modal"
         
-        headers = {
-            'accept': 'text/html,*/*',
-            'accept-language': 'en-US,en;q=0.9',
-            'anti-csrftoken-a2z': csrf_token,
-            'content-type': 'application/json',
-            'device-memory': '8',
-            'downlink': '8.85',
-            'dpr': '1',
-            'ect': '4g',
-            'origin': 'https://www.amazon.in',
-            'referer': 'https://www.amazon.in/',
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36',
-            'viewport-width': '1120',
-            'x-requested-with': 'XMLHttpRequest'
-        }
+        headers = {**MODAL_HEADERS, 'anti-csrftoken-a2z': csrf_token}
 
         try:
             response = self.session.get(modal_url, headers=headers)
@@ -291,33 +478,25 @@ class AmazonScraper:
                 self._log_error(f"Modal request failed with status code: {response.status_code}")
                 return None
 
-            # Extract CSRF token using string operations
+            # Extract CSRF token with the precompiled patterns
             self._log_info("Extracting modal CSRF token...")
             extraction_start = time.time()
-            html = response.text
+            html = response.content
 
             try:
                 # Find the script tag containing CSRF token
-                script_start = html.find('<script type="text/javascript">')
+                script_start = html.find(b'<script type="text/javascript">')
                 if script_start == -1:
                     self._log_error("Script tag not found")
                     return None
 
-                # Find CSRF token declaration
-                csrf_start = html.find('CSRF_TOKEN : "', script_start)
-                if csrf_start == -1:
+                # Find CSRF token declaration and extract the token
+                csrf_match = _RE_MODAL_CSRF_TOKEN.search(html, script_start)
+                if not csrf_match:
                     self._log_error("CSRF token declaration not found")
                     return None
 
-                # Extract the token
-                token_start = csrf_start + len('CSRF_TOKEN : "')
-                token_end = html.find('"', token_start)
-                
-                if token_end == -1:
-                    self._log_error("Could not find end of CSRF token")
-                    return None
-
-                csrf_token = html[token_start:token_end]
+                csrf_token = csrf_match.group(1).decode('utf-8', 'ignore')
                 extraction_time = round((time.time() - extraction_start) * 1000, 2)  # Convert to milliseconds
                 self._log_success(f"Modal CSRF token extracted in {extraction_time}ms: {csrf_token[:10]}...")
                 return csrf_token
@@ -344,34 +523,9 @@ class AmazonScraper:
             base_url += "&filters=%257B%2522primeEligible%2522%253Atrue%257D"
         else:
             base_url += "&filters=%257B%2522all%2522%253Atrue%257D"
-        headers = {
-            'accept': 'text/html,*/*',
-            'accept-language': 'en-US,en;q=0.9,be;q=0.8,ar;q=0.7',
-            'device-memory': '8',
-            'dnt': '1',
-            'downlink': '8.65',
-            'dpr': '1',
-            'ect': '4g',
-            'priority': 'u=1, i',
-            'referer': 'https://www.amazon.in/SanDisk-Extreme-microSDXC-Memory-Adapter/dp/B09X7CRKRZ/136-1912212-8057361?pd_rd_w=YOwz1&content-id=amzn1.sym.53b72ea0-a439-4b9d-9319-7c2ee5c88973&pf_rd_p=53b72ea0-a439-4b9d-9319-7c2ee5c88973&pf_rd_r=VBP362SNAXS96Y4DP9V1&pd_rd_wg=Z1aCo&pd_rd_r=ff18059e-7648-474f-8a5c-4a7ed8d8ba55&pd_rd_i=B09X7CRKRZ&th=1',
-            'rtt': '150',
-            'sec-ch-device-memory': '8',
-            'sec-ch-dpr': '1',
-            'sec-ch-ua': '"Not A(Brand";v="8", "Chromium";v="132", "Google Chrome";v="132"',
-            'sec-ch-ua-mobile': '?0',
-            'sec-ch-ua-platform': '"Windows"',
-            'sec-ch-ua-platform-version': '"15.0.0"',
-            'sec-ch-viewport-width': '1674',
-            'sec-fetch-dest': 'empty',
-            'sec-fetch-mode': 'cors',
-            'sec-fetch-site': 'same-origin',
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/132.0.0.0 Safari/537.36',
-            'viewport-width': '1674',
-            'x-requested-with': 'XMLHttpRequest'
-        }
         
         try:
-            response = self.session.get(base_url, headers=headers)
+            response = self.session.get(base_url, headers=OFFERS_PAGE_HEADERS)
             
             if response.status_code == 200:
                 self._log_success(f"Offers page fetched successfully{' (Prime only)' if prime_only else ''}")
@@ -384,35 +538,46 @@ class AmazonScraper:
             return None
 
     def _save_to_file(self, data, filename, is_html=False):
-        """Helper method to save data to a file"""
+        """Helper method to save data to a file (written in the background)"""
         if not (SAVE_OUTPUT or SAVE_DEBUG):
             return
             
+        # Determine which directory to use based on file type
+        target_dir = self.debug_dir if is_html else self.output_dir
+        filepath = os.path.join(target_dir, filename)
+        _file_write_executor.submit(self._write_file, filepath, data, is_html)
+
+    def _write_file(self, filepath, data, is_html):
+        """Write HTML (text or raw response bytes) or JSON data to filepath, runs
+        on the file write thread"""
         try:
-            # Determine which directory to use based on file type
-            target_dir = self.debug_dir if is_html else self.output_dir
-            filepath = os.path.join(target_dir, filename)
-            
-            mode = 'w'
-            encoding = 'utf-8' if is_html else None
-            
-            with open(filepath, mode, encoding=encoding) as f:
-                if is_html:
+            if is_html and isinstance(data, bytes):
+                # Raw response bytes go to disk as they are, no decode/encode round trip
+                with open(filepath, 'wb') as f:
                     f.write(data)
-                else:
-                    json.dump(data, f, indent=2)
+            elif is_html:
+                with open(filepath, 'w', encoding='utf-8', errors='ignore') as f:
+                    f.write(data)
+            else:
+                write_json(filepath, data)
                     
             self._log_success(f"Data saved to: {filepath}")
         except Exception as e:
-            self._log_error(f"Failed to save data to {filename}: {str(e)}")
+            self._log_error(f"Failed to save data to {filepath}: {str(e)}")
 
-    def initialize_session(self, test_asin="B09X7CRKRZ"):
-        """Initialize a fresh session with cookies and return success status"""
+    def initialize_session(self, test_asin="B09X7CRKRZ", parse_details=False):
+        """Initialize the session with cookies and return success status
+
+        With parse_details the product page fetched for the cookies is also
+        parsed, so it need not be requested again for test_asin.
+        """
         try:
-            if not self._create_fresh_session():
+            # The session is kept for the scraper's lifetime so cookies and
+            # connections carry over between products
+            if not self.session and not self._create_fresh_session():
                 return False
                 
-            self.initial_csrf_token = self._make_initial_product_page_request(test_asin)
+            self.initial_csrf_token = self._make_initial_product_page_request(test_asin, parse_details=parse_details)
             
             if not self.initial_csrf_token:
                 self._log_error("Failed to get initial CSRF token")
@@ -428,17 +593,18 @@ class AmazonScraper:
     def get_product_data(self, asin: str) -> Dict[str, Any]:
         """Get product data for a given ASIN"""
         try:
-            # Initialize session if not already done
+            # Initialize session if not already done. The product page fetched
+            # for that already provides this product's CSRF token and details
             if not self.is_initialized:
-                if not self.initialize_session(asin):
+                if not self.initialize_session(asin, parse_details=True):
                     self._log_error("Failed to initialize session")
                     return None
-            
-            # Get CSRF token and product details for the product page
-            self.initial_csrf_token = self._make_initial_product_page_request(asin, parse_details=True)
-            if not self.initial_csrf_token:
-                self._log_error("Failed to get CSRF token for product")
-                return None
+            else:
+                # Get CSRF token and product details for the product page
+                self.initial_csrf_token = self._make_initial_product_page_request(asin, parse_details=True)
+                if not self.initial_csrf_token:
+                    self._log_error("Failed to get CSRF token for product")
+                    return None
             
             # Get modal CSRF token
             csrf_token2 = self._make_modal_html_request(self.initial_csrf_token)
@@ -446,11 +612,12 @@ class AmazonScraper:
                 self._log_error("Failed to get modal CSRF token")
                 return None
 
-            # Initialize final data object
+            # Initialize final data object - product details are filled in once
+            # the offers pages are done
             final_data = {
                 "asin": asin,
                 "timestamp": int(time.time()),
-                "product_details": self.product_details,
+                "product_details": None,
                 "offers_data": None
             }
             
@@ -462,37 +629,49 @@ class AmazonScraper:
                 self._log_error("Failed to get all offers page")
                 return None
             
+            # When the page looks like it has the Prime filter, request the
+            # Prime-only page right away instead of after parsing this one
+            prime_offers_future = None
+            if may_have_prime_filter(all_offers_html):
+                prime_offers_future = self._get_executor().submit(
+                    self._get_offers_page, asin, csrf_token2, prime_only=True
+                )
+
             try:
-                offers_json, has_prime_filter = parse_offers(all_offers_html)
-                all_offers_data = json.loads(offers_json)
+                all_offers_data, has_prime_filter = parse_offers(all_offers_html, dump_dir=self.offers_dump_dir)
                 
                 self._log_success(f"All offers page parsed successfully - Found {len(all_offers_data)} offers")
                 self._log_info(f"Prime filter available: {has_prime_filter}")
                 
                 prime_offers_data = []
-                # Only make Prime-only request if Prime filter exists
+                # Only use the Prime-only page if Prime filter exists
                 if has_prime_filter:
-                    prime_offers_html = self._get_offers_page(asin, csrf_token2, prime_only=True)
+                    if prime_offers_future is not None:
+                        prime_offers_html = prime_offers_future.result()
+                    else:
+                        prime_offers_html = self._get_offers_page(asin, csrf_token2, prime_only=True)
                     if prime_offers_html:
                         try:
-                            prime_offers_json, _ = parse_offers(prime_offers_html)
-                            prime_offers_data = json.loads(prime_offers_json)
+                            prime_offers_data, _ = parse_offers(prime_offers_html, dump_dir=self.offers_dump_dir)
                             self._log_success(f"Prime offers page parsed successfully - Found {len(prime_offers_data)} Prime eligible offers")
                         except Exception as e:
                             self._log_error(f"Failed to parse Prime offers page: {str(e)}")
                 else:
+                    if prime_offers_future is not None:
+                        # Wait for the speculative request so the session is idle before the next product
+                        prime_offers_future.result()
                     self._log_info("No Prime filter available - skipping Prime-only request")
 
-                # Merge offers data
-                offers_data = []
-                prime_seller_ids = {offer['seller_id'] for offer in prime_offers_data}
-                
+                # Merge offers data. The offer dicts were just built by parse_offers,
+                # so they are updated in place rather than copied into a new list
+                prime_seller_ids = frozenset(offer['seller_id'] for offer in prime_offers_data)
                 for offer in all_offers_data:
                     offer['prime'] = offer['seller_id'] in prime_seller_ids
-                    offers_data.append(offer)
+                offers_data = all_offers_data
                 
                 # Update final data
                 final_data["offers_data"] = offers_data
+                final_data["product_details"] = self.product_details_future.result()
                 
                 return final_data
 
@@ -500,17 +679,28 @@ class AmazonScraper:
                 self._log_error(f"Failed to parse all offers page: {str(e)}")
                 return None
 
+            finally:
+                # On every path out, the speculative Prime request must not
+                # still be using self.session when the next product starts
+                if prime_offers_future is not None and not prime_offers_future.cancel():
+                    wait([prime_offers_future])
+
         except Exception as e:
             self._log_error(f"Unexpected error: {str(e)}")
             return None
 
 # Example usage:
 if __name__ == "__main__":
+    # Console colors are only needed when run as a script
+    from datetime import datetime
+    from colorama import Fore, Style
+    init_colors()
+
     try:
-        scraper = AmazonScraper()
         asin = "B09X7CRKRZ"
         
-        result = scraper.get_product_data(asin)
+        with AmazonScraper() as scraper:
+            result = scraper.get_product_data(asin)
         if result:
             print(f"\n{Fore.GREEN}[SUCCESS] Data collection completed successfully!{Style.RESET_ALL}")
             print(f"Total offers: {len(result['offers_data'])}")
@@ -525,8 +715,7 @@ if __name__ == "__main__":
                 filename = f'output/product_{asin}_{timestamp}.json'
                 
                 # Save the result
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(result, f, indent=2, ensure_ascii=False)
+                write_json(filename, result)
                 
                 print(f"{Fore.GREEN}[SUCCESS] Saved product data to {filename}{Style.RESET_ALL}")
             except Exception as e:
@@ -1,43 +1,116 @@
 import csv
 import os
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Set
+from functools import lru_cache
+from typing import Dict, Iterable, List, Any, Optional
+
+# Buffer size for CSV files - one product row can hold hundreds of fields,
+# so a large buffer turns the many small field writes into few
+CSV_WRITE_BUFFER_SIZE = 1 << 20
 
 
 def flatten_json(json_data: Dict[str, Any], parent_key: str = '', separator: str = '_') -> Dict[str, Any]:
     """
-    Recursively flatten a nested JSON structure into a single-level dictionary.
+    Flatten a nested JSON structure into a single-level dictionary.
+    
+    Nested dictionaries are walked with an explicit stack of iterators instead
+    of recursive calls, so deep nesting costs no call frames and keys come out
+    in the same (depth-first) order.
     
     Args:
         json_data: The nested JSON data to flatten
-        parent_key: The parent key for nested elements (used in recursion)
+        parent_key: Key prefix for all flattened keys
         separator: The character to use for joining nested keys
         
     Returns:
         A flattened dictionary
     """
     items = {}
-    for k, v in json_data.items():
-        new_key = f"{parent_key}{separator}{k}" if parent_key else k
-        
-        if isinstance(v, dict):
-            items.update(flatten_json(v, new_key, separator))
-        elif isinstance(v, list):
-            # Handle list items
-            if all(isinstance(item, dict) for item in v):
-                # For lists of dictionaries (like offers)
-                for i, item in enumerate(v):
-                    items.update(flatten_json(item, f"{new_key}_{i+1}", separator))
-            else:
+    # Each frame is (key prefix, iterator over the items still to visit)
+    stack = [(parent_key, iter(json_data.items()))]
+    while stack:
+        prefix, entries = stack[-1]
+        for k, v in entries:
+            new_key = f"{prefix}{separator}{k}" if prefix else k
+            
+            # Exact type checks - product data only holds plain JSON types,
+            # and a type identity test is cheaper than isinstance per value
+            value_type = type(v)
+            if value_type is dict:
+                stack.append((new_key, iter(v.items())))
+                break
+            elif value_type is list:
+                # Handle list items - frames for the items are built in the
+                # same pass that checks they are all dictionaries
+                frames = []
+                for i, item in enumerate(v, 1):
+                    if type(item) is not dict:
+                        break
+                    frames.append((f"{new_key}_{i}", iter(item.items())))
+                else:
+                    # For lists of dictionaries (like offers). Frames are pushed
+                    # last item first so the first item is visited first
+                    frames.reverse()
+                    stack.extend(frames)
+                    break
                 # For simple lists, join the values
-                for i, item in enumerate(v):
-                    items[f"{new_key}_{i+1}"] = item
+                for i, item in enumerate(v, 1):
+                    items[f"{new_key}_{i}"] = item
+            else:
+                items[new_key] = v
         else:
-            items[new_key] = v
+            # This frame's items are exhausted
+            stack.pop()
             
     return items
 
 
+@lru_cache(maxsize=None)
+def _ensure_dir(directory: str) -> None:
+    os.makedirs(directory, exist_ok=True)
+
+
+def ensure_parent_dir(filename: str) -> None:
+    """Create the directory of filename unless this process already did
+    
+    Saving many files into the same directory then costs one makedirs
+    call instead of one per file.
+    """
+    _ensure_dir(os.path.dirname(filename) or '.')
+
+
+@lru_cache(maxsize=1024)
+def format_timestamp(timestamp: float) -> str:
+    """Format a Unix timestamp as local date and time for the CSV
+    
+    Products are stamped with whole seconds, so the products of a bulk run
+    share a handful of values and the formatted strings are cached.
+    """
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+
+
+# Column limits of format_product_data_for_csv
+MAX_IMAGES = 5
+MAX_OFFERS = 5
+MAX_APLUS_ITEMS = 10
+
+# Indexed column names built once at import instead of formatted for every
+# product. Feature bullets have no fixed limit, so names past the table are
+# still formatted on demand
+_FEATURE_KEYS = tuple(f'Feature_{i}' for i in range(1, 21))
+_IMAGE_URL_KEYS = tuple(f'Image_{i}_URL' for i in range(1, MAX_IMAGES + 1))
+_OFFER_PREFIXES = tuple(f'Offer_{i}_' for i in range(1, MAX_OFFERS + 1))
+# A+ columns per item position: content type -> (column, content field) pairs
+_APLUS_COLUMNS = tuple(
+    {
+        'heading': ((f'APlus_{i}_heading', 'text'),),
+        'text': ((f'APlus_{i}_text', 'text'),),
+        'image': ((f'APlus_{i}_image_url', 'url'), (f'APlus_{i}_image_alt', 'alt')),
+    }
+    for i in range(1, MAX_APLUS_ITEMS + 1)
+)
+
+
 def format_product_data_for_csv(product_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Format product data for CSV export by extracting and flattening key information.
@@ -51,7 +124,7 @@ def format_product_data_for_csv(product_data: Dict[str, Any]) -> Dict[str, Any]:
     # Create a base CSV data dictionary with top-level fields
     csv_data = {
         'ASIN': product_data.get('asin', ''),
-        'Timestamp': datetime.fromtimestamp(product_data.get('timestamp', 0)).strftime('%Y-%m-%d %H:%M:%S'),
+        'Timestamp': format_timestamp(product_data.get('timestamp', 0)),
     }
     
     # Extract product details
@@ -70,14 +143,15 @@ def format_product_data_for_csv(product_data: Dict[str, Any]) -> Dict[str, Any]:
         
         # Add feature bullets
         feature_bullets = main_section.get('feature_bullets', [])
-        for i, feature in enumerate(feature_bullets, 1):
-            csv_data[f'Feature_{i}'] = feature
+        for i, feature in enumerate(feature_bullets):
+            key = _FEATURE_KEYS[i] if i < len(_FEATURE_KEYS) else f'Feature_{i + 1}'
+            csv_data[key] = feature
             
         # Add media images (first few only to avoid too many columns)
         media = main_section.get('media', {})
         images = media.get('images', [])
-        for i, img in enumerate(images[:5], 1):  # Limit to first 5 images
-            csv_data[f'Image_{i}_URL'] = img.get('url', '')
+        for key, img in zip(_IMAGE_URL_KEYS, images):  # Limit to first MAX_IMAGES images
+            csv_data[key] = img.get('url', '')
     
     # Add review histogram data
     reviews = product_details.get('reviews_histogram_section', {})
@@ -106,21 +180,16 @@ def format_product_data_for_csv(product_data: Dict[str, Any]) -> Dict[str, Any]:
     
     # Add offers data
     offers = product_data.get('offers_data', [])
-    for i, offer in enumerate(offers[:5], 1):  # Limit to first 5 offers
+    for prefix, offer in zip(_OFFER_PREFIXES, offers):  # Limit to first MAX_OFFERS offers
         for key, value in offer.items():
-            csv_data[f'Offer_{i}_{key}'] = value
+            csv_data[f'{prefix}{key}'] = value
             
     # Add any a-plus content
     aplus_content = product_details.get('aplus_content', [])
-    for i, content in enumerate(aplus_content[:10], 1):  # Limit to first 10 items
-        content_type = content.get('type', '')
-        if content_type == 'heading':
-            csv_data[f'APlus_{i}_heading'] = content.get('text', '')
-        elif content_type == 'text':
-            csv_data[f'APlus_{i}_text'] = content.get('text', '')
-        elif content_type == 'image':
-            csv_data[f'APlus_{i}_image_url'] = content.get('url', '')
-            csv_data[f'APlus_{i}_image_alt'] = content.get('alt', '')
+    for columns, content in zip(_APLUS_COLUMNS, aplus_content):  # Limit to first MAX_APLUS_ITEMS items
+        # Unknown content types have no columns
+        for key, field in columns.get(content.get('type', ''), ()):
+            csv_data[key] = content.get(field, '')
     
     return csv_data
 
@@ -139,7 +208,8 @@ def get_complete_flattened_data(product_data: Dict[str, Any]) -> Dict[str, Any]:
     return flatten_json(product_data)
 
 
-def save_as_csv(product_data: Dict[str, Any], filename: str, use_complete_flattening: bool = False) -> Optional[Dict[str, Any]]:
+def save_as_csv(product_data: Dict[str, Any], filename: str, use_complete_flattening: bool = False,
+                precomputed_row: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
     """
     Save product data to a CSV file.
     
@@ -147,22 +217,27 @@ def save_as_csv(product_data: Dict[str, Any], filename: str, use_complete_flatte
         product_data: The product data dictionary
         filename: Path to save the CSV file
         use_complete_flattening: Whether to use complete flattening (all fields) or selective formatting
+        precomputed_row: Row already built from product_data with the same
+            method (e.g. the one returned by export_product_data), written
+            as is instead of flattening the product again
         
     Returns:
         The CSV row data or None if an error occurred
     """
     try:
         # Choose the flattening method based on the flag
-        if use_complete_flattening:
+        if precomputed_row is not None:
+            csv_data = precomputed_row
+        elif use_complete_flattening:
             csv_data = get_complete_flattened_data(product_data)
         else:
             csv_data = format_product_data_for_csv(product_data)
         
         # Create the directory if it doesn't exist
-        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+        ensure_parent_dir(filename)
         
         # Write to CSV
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
+        with open(filename, 'w', newline='', encoding='utf-8', buffering=CSV_WRITE_BUFFER_SIZE) as f:
             writer = csv.DictWriter(f, fieldnames=csv_data.keys())
             writer.writeheader()
             writer.writerow(csv_data)
@@ -174,6 +249,22 @@ def save_as_csv(product_data: Dict[str, Any], filename: str, use_complete_flatte
         return None
 
 
+# Field name prefixes for sort_fieldnames, as tuples for str.startswith.
+# Priority prefixes, in the order we want them to appear
+PRIORITY_PREFIXES = (
+    'asin', 'ASIN', 'timestamp', 'Timestamp',
+    'product_details_main_product_details_section',
+    'product_details_reviews_histogram_section',
+    'product_details_product_information_section',
+    'product_details_aplus_content',
+    'product_details',
+    'Brand', 'Title', 'Price', 'Average_Rating', 'Review'
+)
+
+# Secondary importance fields
+SECONDARY_PREFIXES = ('offers_data', 'Offer_')
+
+
 def sort_fieldnames(fieldnames: List[str]) -> List[str]:
     """
     Sort fieldnames to ensure product details come first, followed by offers data.
@@ -184,33 +275,18 @@ def sort_fieldnames(fieldnames: List[str]) -> List[str]:
     Returns:
         Sorted list of field names
     """
-    # Define priority prefixes in the order we want them to appear
-    priority_prefixes = [
-        'asin', 'ASIN', 'timestamp', 'Timestamp',
-        'product_details_main_product_details_section',
-        'product_details_reviews_histogram_section',
-        'product_details_product_information_section',
-        'product_details_aplus_content',
-        'product_details',
-        'Brand', 'Title', 'Price', 'Average_Rating', 'Review'
-    ]
-    
-    # Secondary importance fields
-    secondary_prefixes = [
-        'offers_data', 'Offer_'
-    ]
-    
     # Group fields by their importance
     priority_fields = []
     secondary_fields = []
     remaining_fields = []
     
     for field in fieldnames:
-        # Check if field matches any priority prefix
-        if any(field.startswith(prefix) for prefix in priority_prefixes):
+        # Check if field matches any priority prefix - str.startswith takes
+        # the whole tuple, so the prefixes are checked in one call
+        if field.startswith(PRIORITY_PREFIXES):
             priority_fields.append(field)
         # Check if field matches any secondary prefix
-        elif any(field.startswith(prefix) for prefix in secondary_prefixes):
+        elif field.startswith(SECONDARY_PREFIXES):
             secondary_fields.append(field)
         # If no match, add to remaining fields
         else:
@@ -225,13 +301,18 @@ def sort_fieldnames(fieldnames: List[str]) -> List[str]:
     return priority_fields + remaining_fields + secondary_fields
 
 
-def save_combined_csv(csv_data_list: List[Dict[str, Any]], filename: str) -> bool:
+def save_combined_csv(csv_data_list: Iterable[Dict[str, Any]], filename: str,
+                      fieldnames: Optional[Iterable[str]] = None) -> bool:
     """
     Save multiple products' data to a single CSV file.
     
     Args:
-        csv_data_list: List of CSV data dictionaries
+        csv_data_list: List of CSV data dictionaries. May be any iterable
+            (e.g. rows streamed from disk) when fieldnames are given, as
+            the rows are then only read once
         filename: Path to save the combined CSV file
+        fieldnames: All field names of the rows, collected from the rows
+            themselves when not given
         
     Returns:
         True if successful, False otherwise
@@ -240,22 +321,24 @@ def save_combined_csv(csv_data_list: List[Dict[str, Any]], filename: str) -> boo
         return False
         
     try:
-        # Get all possible field names from all products
-        all_fields: Set[str] = set()
-        for data in csv_data_list:
-            all_fields.update(data.keys())
+        # Get all possible field names from all products in one pass
+        # (sort_fieldnames fixes the final order)
+        if fieldnames is None:
+            fieldnames = dict.fromkeys(field for data in csv_data_list for field in data)
             
         # Sort fieldnames to put product details first, then offers
-        fieldnames = sort_fieldnames(list(all_fields))
+        fieldnames = sort_fieldnames(list(fieldnames))
         
         # Create the directory if it doesn't exist
-        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+        ensure_parent_dir(filename)
         
-        # Write all products to a single CSV
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(csv_data_list)
+        # Write all products to a single CSV. Rows are assembled in fieldname
+        # order for a plain csv.writer (missing fields left empty, as
+        # DictWriter's restval did) so no per-row key validation is done
+        with open(filename, 'w', newline='', encoding='utf-8', buffering=CSV_WRITE_BUFFER_SIZE) as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows([data.get(field, '') for field in fieldnames] for data in csv_data_list)
             
         return True
     except Exception as e:
@@ -1,18 +1,112 @@
-import os
+import itertools
 import json
+import pickle
+import tempfile
+import threading
 from datetime import datetime
-from colorama import Fore, Style
-from typing import List, Dict, Any, Tuple
+from pathlib import Path
+from typing import Iterator, List, Dict, Any, Optional, Tuple, Union
 
-from .csv_formatter import save_combined_csv, get_complete_flattened_data
+from .csv_formatter import ensure_parent_dir, save_combined_csv, get_complete_flattened_data
+from .logger import setup_logger
 
+try:
+    # Optional faster JSON encoder (pip install orjson)
+    import orjson
+except ImportError:
+    orjson = None
 
-def export_product_data(result: Dict[str, Any], asin: str) -> Tuple[bool, Dict[str, Any]]:
+# Colors come from the shared ColoredFormatter, not from the messages
+logger = setup_logger('Exporter')
+
+
+# Directory all export files are written to
+OUTPUT_DIR = Path('output')
+
+
+def ensure_output_dir() -> None:
+    """Create the output directory - called once per run, not once per product"""
+    OUTPUT_DIR.mkdir(exist_ok=True)
+
+
+def dump_json_bytes(data: Any) -> bytes:
+    """Serialize data as indented UTF-8 JSON, using orjson when available"""
+    if orjson is not None:
+        # Non-string keys occur in product data (e.g. review star levels)
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+class CsvRowSpool:
+    """Flattened CSV rows of a run, spooled to a temporary file on disk
+
+    Rows are pickled to the file as they arrive, so a run only keeps the
+    union of field names and one file offset per product in memory instead
+    of every product's row. `rows()` reads them back in slot order, which
+    lets workers finish in any order while the CSV keeps the input order.
+    Safe to append to from several threads.
+    """
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile()
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        # (slot, file offset) of every spooled row
+        self._offsets = []
+        # Field names of all rows, in first-seen order
+        self.fieldnames = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def append(self, row: Dict[str, Any], slot: Optional[int] = None) -> None:
+        """Spool one row; rows without a slot keep their append order"""
+        data = pickle.dumps(row, protocol=pickle.HIGHEST_PROTOCOL)
+        fields = dict.fromkeys(row)
+        with self._lock:
+            if slot is None:
+                slot = next(self._sequence)
+            # rows() leaves the position inside earlier rows - always append at the end
+            self._offsets.append((slot, self._file.seek(0, 2)))
+            self._file.write(data)
+            self.fieldnames.update(fields)
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Yield the spooled rows one at a time, in slot order
+
+        Rows appended while iterating are not included. The lock is never
+        held across a yield, so appends are not blocked by a reader.
+        """
+        with self._lock:
+            offsets = sorted(self._offsets, key=lambda entry: entry[0])
+        for _, offset in offsets:
+            with self._lock:
+                self._file.seek(offset)
+                row = pickle.load(self._file)
+            yield row
+
+    def close(self) -> None:
+        """Delete the spool file"""
+        self._file.close()
+
+
+def export_product_data(result: Dict[str, Any], asin: str, timestamp: Optional[str] = None) -> Tuple[bool, Dict[str, Any]]:
     """Export product data to JSON and prepare CSV data
     
+    The output directory is created on first use, so callers need not call
+    ensure_output_dir() first.
+
     Args:
         result: The product data to export
         asin: The ASIN of the product
+        timestamp: Run-level filename timestamp, defaults to the current time
         
     Returns:
         Tuple containing:
@@ -20,17 +114,19 @@ def export_product_data(result: Dict[str, Any], asin: str) -> Tuple[bool, Dict[s
         - dict: CSV row data for combined CSV export
     """
     try:
-        # Create output directory if it doesn't exist
-        os.makedirs('output', exist_ok=True)
-
-        # Generate timestamp for filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Generate timestamp for filename unless the run provided one
+        if timestamp is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # Save as JSON
-        json_filename = f'output/product_{asin}_{timestamp}.json'
-        with open(json_filename, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
-        print(f"{Fore.GREEN}[SUCCESS] Saved product data to {json_filename}{Style.RESET_ALL}")
+        # Save as JSON - serialize up front so the file gets a single write
+        # instead of one write() per encoder chunk from json.dump
+        json_filename = str(OUTPUT_DIR / f'product_{asin}_{timestamp}.json')
+        # Cached per directory - one makedirs per process, not per product
+        ensure_parent_dir(json_filename)
+        json_data = dump_json_bytes(result)
+        with open(json_filename, 'wb') as f:
+            f.write(json_data)
+        logger.success("Saved product data to %s", json_filename)
         
         # Prepare CSV data for the combined CSV file
         csv_data = get_complete_flattened_data(result)
@@ -38,15 +134,17 @@ def export_product_data(result: Dict[str, Any], asin: str) -> Tuple[bool, Dict[s
         return True, csv_data
 
     except Exception as e:
-        print(f"{Fore.RED}[ERROR] Failed to export data for ASIN {asin}: {str(e)}{Style.RESET_ALL}")
+        logger.error("Failed to export data for ASIN %s: %s", asin, e)
         return False, None
 
 
-def export_combined_products(combined_csv_data: List[Dict[str, Any]]) -> bool:
+def export_combined_products(combined_csv_data: Union[CsvRowSpool, List[Dict[str, Any]]], timestamp: Optional[str] = None) -> bool:
     """Export combined product data to a single CSV file
     
     Args:
-        combined_csv_data: List of CSV data for each product
+        combined_csv_data: CSV data for each product, as a list or spooled
+            to disk in a CsvRowSpool (streamed into the CSV row by row)
+        timestamp: Run-level filename timestamp, defaults to the current time
         
     Returns:
         bool: Success or failure
@@ -54,14 +152,20 @@ def export_combined_products(combined_csv_data: List[Dict[str, Any]]) -> bool:
     if not combined_csv_data:
         return False
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    combined_filename = f'output/all_products_{timestamp}.csv'
+    if timestamp is None:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    combined_filename = str(OUTPUT_DIR / f'all_products_{timestamp}.csv')
+    
+    if isinstance(combined_csv_data, CsvRowSpool):
+        saved = save_combined_csv(combined_csv_data.rows(), combined_filename, combined_csv_data.fieldnames)
+    else:
+        saved = save_combined_csv(combined_csv_data, combined_filename)
     
-    if save_combined_csv(combined_csv_data, combined_filename):
-        print(f"{Fore.GREEN}[SUCCESS] Saved all product data to {combined_filename}{Style.RESET_ALL}")
+    if saved:
+        logger.success("Saved all product data to %s", combined_filename)
         return True
     else:
-        print(f"{Fore.RED}[ERROR] Failed to save consolidated CSV file{Style.RESET_ALL}")
+        logger.error("Failed to save consolidated CSV file")
         return False
 
 
@@ -72,8 +176,9 @@ def print_summary(total_count: int, success_count: int) -> None:
         total_count: Total number of ASINs processed
         success_count: Number of successfully processed ASINs
     """
-    print(f"\n{Fore.CYAN}=== Summary ==={Style.RESET_ALL}")
-    print(f"Total ASINs processed: {total_count}")
-    print(f"Successfully saved: {success_count}")
-    print(f"Failed: {total_count - success_count}")
-    print(f"Output files are in the 'output' folder") 
\ No newline at end of file
+    # Logged rather than printed so the summary stays behind queued log records
+    logger.info("=== Summary ===")
+    logger.info("Total ASINs processed: %d", total_count)
+    logger.info("Successfully saved: %d", success_count)
+    logger.info("Failed: %d", total_count - success_count)
+    logger.info("Output files are in the '%s' folder", OUTPUT_DIR)
@@ -1,14 +1,24 @@
+import atexit
 import logging
+import queue
 from logging import StreamHandler
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 import sys
 from colorama import init, Fore, Style
 from datetime import datetime
 import os
 from pathlib import Path
 
-# Initialize colorama
-init(autoreset=True)
+# colorama wraps stdout/stderr on every init() call, so entry points go
+# through init_colors() which only does it once per process
+_colors_initialized = False
+
+def init_colors():
+    """Initialize colorama once for colored console output"""
+    global _colors_initialized
+    if not _colors_initialized:
+        init(autoreset=True)
+        _colors_initialized = True
 
 # Create logs directory if it doesn't exist
 LOGS_DIR = Path(__file__).parent / "logs"
@@ -17,6 +27,15 @@ LOGS_DIR.mkdir(exist_ok=True)
 # Constant for max log size
 MAX_BYTES = 5 * 1024 * 1024  # 50MB per file
 
+# Formatted log text buffered in memory before it is written to the log file
+FLUSH_BYTES = 64 * 1024
+
+# Custom SUCCESS level between INFO and WARNING. Registered at import because
+# records are formatted on the listener thread, after logger.success() runs
+if not hasattr(logging, 'SUCCESS'):
+    logging.SUCCESS = 25
+    logging.addLevelName(logging.SUCCESS, 'SUCCESS')
+
 class ColoredFormatter(logging.Formatter):
     """Custom formatter that adds colors to log levels"""
     
@@ -29,41 +48,107 @@ class ColoredFormatter(logging.Formatter):
         'CRITICAL': Fore.RED + Style.BRIGHT
     }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Only color the output if it's going to the console - fixed per formatter
+        self._wants_color = isinstance(self._style._fmt, str) and '%(color_on)s' in self._style._fmt
+        self._reset = Style.RESET_ALL
+
     def format(self, record):
-        # Add custom SUCCESS level color if used
-        if not hasattr(logging, 'SUCCESS'):
-            logging.SUCCESS = 25  # Between INFO and WARNING
-            logging.addLevelName(logging.SUCCESS, 'SUCCESS')
-        
-        # Only color the output if it's going to the console
-        if isinstance(self._style._fmt, str) and '%(color_on)s' in self._style._fmt:
-            record.color_on = self.COLORS.get(record.levelname, '')
-            record.color_off = Style.RESET_ALL
-        else:
-            record.color_on = ''
-            record.color_off = ''
+        color = self.COLORS.get(record.levelname, '') if self._wants_color else ''
+        record.color_on = color
+        record.color_off = self._reset if color else ''
         return super().format(record)
 
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that buffers records and tracks the file size itself
+
+    Formatted records are kept in memory and written in one call once
+    `flush_bytes` have accumulated (and on flush/close). Rollover is decided
+    from a running size count instead of seeking the stream for every record.
+    """
+
+    def __init__(self, *args, flush_bytes=FLUSH_BYTES, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.flush_bytes = flush_bytes
+        self._buffer = []
+        self._buffered_size = 0
+        self._file_size = self._current_file_size()
+
+    def _current_file_size(self):
+        return os.path.getsize(self.baseFilename) if os.path.exists(self.baseFilename) else 0
+
+    def emit(self, record):
+        try:
+            msg = self.format(record) + self.terminator
+            # maxBytes limits encoded bytes - non-ASCII titles take more than one per character
+            size = len(msg) if msg.isascii() else len(msg.encode(self.encoding or 'utf-8', errors='replace'))
+            if self.maxBytes > 0 and self._file_size + self._buffered_size + size >= self.maxBytes:
+                self.flush()
+                self.doRollover()
+                self._file_size = self._current_file_size()
+            self._buffer.append(msg)
+            self._buffered_size += size
+            if self._buffered_size >= self.flush_bytes:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self._buffer:
+                if self.stream is None:
+                    self.stream = self._open()
+                self.stream.write(''.join(self._buffer))
+                self._file_size += self._buffered_size
+                self._buffer.clear()
+                self._buffered_size = 0
+            super().flush()
+        finally:
+            self.release()
+
+    def close(self):
+        self.flush()
+        super().close()
+
+# Console handler shared by every logger so that listener threads of different
+# loggers serialize on one handler lock instead of interleaving lines on stdout
+_console_handler = None
+
+def _get_console_handler():
+    """Return the shared colored console handler, creating it on first use"""
+    global _console_handler
+    if _console_handler is None:
+        # colorama must wrap stdout before the handler captures it
+        init_colors()
+        _console_handler = StreamHandler(sys.stdout)
+        colored_formatter = ColoredFormatter(
+            fmt='%(color_on)s%(asctime)s.%(msecs)03d [%(thread)d] %(levelname)s: %(message)s%(color_off)s',
+            datefmt='%H:%M:%S'
+        )
+        _console_handler.setFormatter(colored_formatter)
+    return _console_handler
+
 def setup_logger(name='AmazonScraper'):
-    """Set up and return a colored logger instance"""
+    """Set up and return a colored logger instance
+
+    Records are handed to a QueueHandler and written by a QueueListener thread,
+    so logging calls never block on console or file I/O. The listener is kept
+    on the logger as `logger.listener`.
+    """
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
     
     # Only add handlers if they don't exist
     if not logger.handlers:
         # Console handler with colors
-        console_handler = StreamHandler(sys.stdout)
-        colored_formatter = ColoredFormatter(
-            fmt='%(color_on)s%(asctime)s.%(msecs)03d [%(thread)d] %(levelname)s: %(message)s%(color_off)s',
-            datefmt='%H:%M:%S'
-        )
-        console_handler.setFormatter(colored_formatter)
-        logger.addHandler(console_handler)
+        console_handler = _get_console_handler()
         
         # File handler without colors
         today = datetime.now().strftime('%Y-%m-%d')
         log_file = LOGS_DIR / f"{name}_{today}.log"
-        file_handler = RotatingFileHandler(
+        file_handler = BufferedRotatingFileHandler(
             log_file,
             maxBytes=MAX_BYTES,
             backupCount=0,  # No backup files, just truncate when limit reached
@@ -74,7 +159,14 @@ def setup_logger(name='AmazonScraper'):
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+
+        # Real handlers are owned by the listener thread
+        log_queue = queue.Queue(-1)
+        listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        logger.addHandler(QueueHandler(log_queue))
+        logger.listener = listener
     
     # Add success method to logger
     def success(self, message, *args, **kwargs):
@@ -6,12 +6,24 @@ from concurrent.futures import ThreadPoolExecutor
 from .utils import load_config
 import time
 
+# Sessions created up front when config.json does not set initial_session_pool_size
+DEFAULT_INITIAL_POOL_SIZE = 5
+
 class SessionPool:
     def __init__(self):
         self.logger = setup_logger('SessionPool')
         self.config = load_config()
         self.sessions = Queue()
         self.lock = threading.Lock()
+        self.initial_size = max(1, self.config.get('initial_session_pool_size', DEFAULT_INITIAL_POOL_SIZE))
+        # Kept for the life of the pool so its threads are started once, not per call
+        self._executor = ThreadPoolExecutor(max_workers=self.initial_size, thread_name_prefix='SessionPoolInit')
+        # Refills are started in the background once fewer than `low_water`
+        # sessions are queued, topping the pool back up to `initial_size`
+        self.low_water = max(2, self.initial_size // 2)
+        self._pending_inits = 0
+        self._next_index = self.initial_size
+        self._closed = False
         
         # Initialize pool with a few sessions
         self.initialize_pool()
@@ -20,15 +32,12 @@ class SessionPool:
         """Initialize the pool with a few sessions"""
         try:
             # Create initial sessions
-            with ThreadPoolExecutor(max_workers=5) as executor:
-                futures = []
-                for i in range(5):  # Start with 5 sessions
-                    future = executor.submit(self._initialize_single_session, i)
-                    futures.append(future)
-                
-                # Wait for all sessions to initialize
-                for future in futures:
-                    future.result()
+            futures = [self._executor.submit(self._initialize_single_session, i)
+                       for i in range(self.initial_size)]
+            
+            # Wait for all sessions to initialize
+            for future in futures:
+                future.result()
                     
             self.logger.info(f"Session pool initialized with {self.sessions.qsize()} sessions")
         except Exception as e:
@@ -49,13 +58,38 @@ class SessionPool:
             self.logger.error(f"Error initializing session {index + 1}: {str(e)}")
             return False
     
+    def _refill_session(self, index):
+        """Initialize a session in the background and release its refill slot"""
+        try:
+            self._initialize_single_session(index)
+        finally:
+            with self.lock:
+                self._pending_inits -= 1
+    
+    def _maybe_refill(self):
+        """Start background initializers when the pool runs low"""
+        with self.lock:
+            queued = self.sessions.qsize()
+            if self._closed or queued >= self.low_water:
+                return
+            missing = self.initial_size - queued - self._pending_inits
+            # Submitted under the lock, so close() cannot shut the executor
+            # down between the _closed check and the submits
+            for _ in range(max(0, missing)):
+                self._pending_inits += 1
+                self._executor.submit(self._refill_session, self._next_index)
+                self._next_index += 1
+    
     def get_session(self):
         """Get a session from the pool"""
         try:
-            return self.sessions.get(timeout=10)  # 10 second timeout
+            session = self.sessions.get(timeout=10)  # 10 second timeout
         except:
             self.logger.warning("No sessions available, creating new one")
             return self._create_new_session()
+        # Start creating replacements while the caller uses this one
+        self._maybe_refill()
+        return session
     
     def _create_new_session(self):
         """Create a new session if pool is empty"""
@@ -68,10 +102,17 @@ class SessionPool:
         """Return a session to the pool"""
         if session and session.is_initialized:
             self.sessions.put(session)
+        self._maybe_refill()
     
     def get_pool_size(self):
         """Get current number of available sessions"""
         return self.sessions.qsize()
+    
+    def close(self):
+        """Stop the pool's initializer threads"""
+        with self.lock:
+            self._closed = True
+        self._executor.shutdown(wait=False)
 
 def test_session_pool():
     """Test function to initialize a single session"""
@@ -93,6 +134,7 @@ def test_session_pool():
         print("Failed to get a session")
     
     print(f"Final pool size: {pool.get_pool_size()}")
+    pool.close()
     print("\n=== Test completed ===")
 
 if __name__ == "__main__":
@@ -1,6 +1,9 @@
 import json
 import os
+import time
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 
 # Handle imports differently based on how the script is being run
 try:
@@ -12,26 +15,82 @@ except ImportError:
 
 logger = setup_logger('Utils')
 
+def _freeze(value):
+    """Return value with every nested dict made a read-only mapping and every list a tuple"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+# Used when config.json cannot be read or parsed
+DEFAULT_CONFIG = _freeze({
+    "initial_session_pool_size": 5,
+    "allow_proxy": False,
+    "max_workers": 5,
+    "concurrent_requests_control": {
+        "initial_concurrent": 3,
+        "scale_up_delay": 0.0005,
+        "scale_increment": 2
+    }
+})
+
+@lru_cache(maxsize=1)
+def _read_config():
+    """Read and freeze config.json - only a successful read is cached"""
+    config_path = Path(__file__).parent.parent / "config" / "config.json"
+    with open(config_path, "r") as f:
+        config = _freeze(json.load(f))
+    logger.info(f"Loaded configuration")
+    return config
+
 def load_config():
     """
     Load configuration from config.json file
+
+    The file is read once per process; every call shares the same result,
+    frozen all the way down so no caller can change it for the others. A
+    failed read is not cached - the defaults are returned and the next call
+    tries the file again.
     """
-    config_path = Path(__file__).parent.parent / "config" / "config.json"
-    
     try:
-        with open(config_path, "r") as f:
-            config = json.load(f)
-            logger.info(f"Loaded configuration")
-            return config
+        return _read_config()
     except Exception as e:
         logger.error(f"Error loading config.json: {e}")
         # Return default configuration
-        return {
-            "initial_session_pool_size": 5,
-            "allow_proxy": False,
-            "concurrent_requests_control": {
-                "initial_concurrent": 3,
-                "scale_up_delay": 0.0005,
-                "scale_increment": 2
-            }
-        } 
\ No newline at end of file
+        return DEFAULT_CONFIG
+
+class TTLCache:
+    """
+    Small dict-backed cache whose entries expire `ttl` seconds after they
+    were stored. Expired entries are dropped when they are looked up, and the
+    oldest entry is evicted once `max_entries` is reached.
+    """
+
+    def __init__(self, ttl, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key, value):
+        """Store value for key, evicting the oldest entry when full"""
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.max_entries:
+            # Dicts keep insertion order, so the first key is the oldest entry
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (time.monotonic(), value)
+
+    def clear(self):
+        """Drop all entries"""
+        self._entries.clear()